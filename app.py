@@ -1,12 +1,14 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
 
 # 匯入自訂功能
 from utils.bigquery_data import (
     get_top10_predictions,
-    get_model_performance
+    get_model_performance,
+    prefetch,
+    MOCK_TOP10_PREDICTIONS
 )
+from utils.charts import build_top10_figure
+from utils.sidebar import render_sidebar
 
 # ========== 設定 ==========
 USE_REAL_DATA = True  # ✅ 預設使用真實資料
@@ -19,13 +21,17 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# 每個 session 第一次載入時，先在背景開始讀取 Top 10 預測（同時暖機 BigQuery client），與下方版面渲染重疊
+# 之後的 rerun 直接由快取取得，不必再開執行緒
+top10_future = None
+if USE_REAL_DATA and not st.session_state.get('top10_prefetched'):
+    st.session_state['top10_prefetched'] = True
+    top10_future = prefetch(get_top10_predictions)
+
 # 如果使用假資料，在最上方顯示警告
 if not USE_REAL_DATA:
     st.error("⚠️ 警告：目前使用模擬資料展示，非真實預測結果！")
 
-# Netflix 風格 CSS
-from utils.sidebar import render_sidebar
-
 # Render shared sidebar
 render_sidebar()
 
@@ -43,7 +49,12 @@ else:
 
 if USE_REAL_DATA:
     with st.spinner("正在從 BigQuery 載入本週預測資料..."):
-        res = get_top10_predictions()
+        try:
+            res = top10_future.result() if top10_future is not None else get_top10_predictions()
+        except Exception:
+            # 詳細錯誤已記錄在伺服器端 log
+            st.error("❌ 暫時無法讀取預測資料，請稍後再試")
+            res = None
 
     if res is not None:
         top10_data, snapshot_table = res
@@ -58,6 +69,8 @@ if USE_REAL_DATA:
         # 準備顯示用的 DataFrame
         display_df = top10_data[['title', 'type', 'country', 'viral_probability']].copy()
         display_df.columns = ['作品名稱', '類型', '製作國家', '爆紅機率']
+        # 只需要 0.1% 精度，用 float32 減少傳給前端的資料量
+        display_df['爆紅機率'] = display_df['爆紅機率'].astype('float32')
         display_df.insert(0, '排名', range(1, len(display_df) + 1))
         
         # 顯示表格
@@ -76,29 +89,7 @@ if USE_REAL_DATA:
         )
         
         # 視覺化
-        fig = go.Figure(data=[
-            go.Bar(
-                x=display_df['爆紅機率'],
-                y=display_df['作品名稱'],
-                orientation='h',
-                marker=dict(
-                    color=display_df['爆紅機率'],
-                    colorscale='Reds',
-                    showscale=False
-                ),
-                text=[f"{x:.1f}%" for x in display_df['爆紅機率']],
-                textposition='auto',
-            )
-        ])
-        
-        fig.update_layout(
-            title='Top 10 作品爆紅機率視覺化',
-            xaxis_title='爆紅機率 (%)',
-            yaxis_title='',
-            height=400,
-            yaxis={'categoryorder': 'total ascending'}
-        )
-        
+        fig = build_top10_figure(display_df)
         st.plotly_chart(fig, use_container_width=True)
         
         # 顯示模型資訊
@@ -135,20 +126,8 @@ else:
     st.error("🚨 注意：目前使用模擬資料展示")
     st.warning("💡 這不是真實的預測結果，僅供功能展示")
     
-    mock_data = pd.DataFrame({
-        '排名': range(1, 11),
-        '作品名稱': [
-            'Stranger Things S5', 'Wednesday S2', 'The Crown S7',
-            'Squid Game S3', 'Bridgerton S4', 'Money Heist: Korea',
-            'The Witcher S4', 'You S5', 'Ozark: The Return', 'Dark Desire S3'
-        ],
-        '類型': ['TV Show'] * 10,
-        '製作國家': ['US', 'US', 'UK', 'KR', 'US', 'KR', 'US', 'US', 'US', 'MX'],
-        '爆紅機率': [95.2, 92.8, 89.5, 87.1, 85.3, 83.0, 81.2, 79.4, 77.6, 75.8]
-    })
-    
     st.dataframe(
-        mock_data,
+        MOCK_TOP10_PREDICTIONS,
         use_container_width=True,
         hide_index=True,
         column_config={
@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 
-from utils.bigquery_data import get_all_titles, get_title_details, get_title_viral_rate
+from utils.bigquery_data import search_titles, get_title_details_with_viral, prefetch, warm_up
 from utils.sidebar import render_sidebar
 
 # ========== 設定 ==========
@@ -13,6 +13,27 @@ st.set_page_config(
     layout="wide"
 )
 
+# 每個 session 只在第一次載入時於背景暖機 BigQuery client 與預測表解析，與頁面渲染重疊
+if USE_REAL_DATA and 'bq_warm_up' not in st.session_state:
+    st.session_state['bq_warm_up'] = prefetch(warm_up)
+
+
+def wait_for_warm_up():
+    """
+    第一次查詢前等待背景暖機完成
+
+    避免第一次搜尋與暖機同時錯過快取、各自呼叫一次 list_tables
+    """
+    future = st.session_state.get('bq_warm_up')
+    if future is None:
+        return
+    try:
+        future.result()
+    except Exception:
+        # 暖機失敗不影響查詢，錯誤會在實際查詢時顯示
+        pass
+    st.session_state['bq_warm_up'] = None
+
 # Render shared sidebar
 render_sidebar()
 
@@ -24,22 +45,33 @@ if not USE_REAL_DATA:
 st.title("🔍 查詢特定作品")
 st.markdown("---")
 
-if USE_REAL_DATA:
+# ========== 搜尋區塊 ==========
+@st.fragment
+def render_search():
+    """
+    作品搜尋與查詢結果
+
+    使用 fragment：輸入關鍵字、選擇作品與按下查詢時只重新執行這個區塊，不會重跑整頁與側邊欄
+    """
     col1, col2 = st.columns([3, 1])
     
     with col1:
-        with st.spinner("載入作品列表..."):
-            all_titles = get_all_titles()
-        
-        if all_titles:
-            selected_title = st.selectbox(
-                "選擇或搜尋作品（輸入英文名稱）",
-                options=all_titles,
-                index=0
-            )
-        else:
-            st.warning("⚠️ 無法載入作品列表")
-            selected_title = None
+        keyword = st.text_input("搜尋作品（輸入英文名稱開頭）").strip()
+
+        selected_title = None
+        if keyword:
+            with st.spinner("搜尋作品中..."):
+                wait_for_warm_up()
+                candidates = search_titles(keyword)
+
+            if candidates:
+                selected_title = st.selectbox(
+                    "選擇作品",
+                    options=candidates,
+                    index=0
+                )
+            else:
+                st.warning("⚠️ 找不到符合的作品")
     
     with col2:
         st.write("")
@@ -48,70 +80,82 @@ if USE_REAL_DATA:
     
     if search_button and selected_title:
         with st.spinner(f"正在查詢《{selected_title}》..."):
-            title_info = get_title_details(selected_title)
+            title_info = get_title_details_with_viral(selected_title)
         
         if title_info:
             st.success(f"✅ 找到作品：{selected_title}")
             
-            # 基本資訊
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("類型", title_info.get('type', 'N/A'))
-                st.metric("國家", title_info.get('country', 'N/A'))
-            
-            with col2:
-                st.metric("語言", title_info.get('language', 'N/A'))
-                st.metric("發行年份", title_info.get('release_year', 'N/A'))
-            
-            with col3:
-                imdb = title_info.get('imdb_rating', 0)
-                st.metric("IMDb 評分", f"{imdb:.1f}/10" if imdb else 'N/A')
-                tmdb_pop = title_info.get('tmdb_popularity', 0)
-                st.metric("TMDB 熱度", f"{tmdb_pop:.1f}" if tmdb_pop else 'N/A')
-            
-            with col4:
-                weeks = title_info.get('weeks_on_top10', 0)
-                st.metric("Top 10 上榜週數", weeks if weeks else '未上榜')
-                best = title_info.get('best_rank', 0)
-                st.metric("最佳排名", f"#{best}" if best and best > 0 else '未上榜')
+            # 基本資訊（以單一表格渲染，取代 4 欄 × 2 個 st.metric）
+            imdb = title_info.get('imdb_rating', 0)
+            tmdb_pop = title_info.get('tmdb_popularity', 0)
+            weeks = title_info.get('weeks_on_top10', 0)
+            best = title_info.get('best_rank', 0)
+
+            summary_df = pd.DataFrame({
+                '項目': ['類型', '國家', '語言', '發行年份',
+                        'IMDb 評分', 'TMDB 熱度', 'Top 10 上榜週數', '最佳排名'],
+                '數值': [
+                    str(title_info.get('type') or 'N/A'),
+                    str(title_info.get('country') or 'N/A'),
+                    str(title_info.get('language') or 'N/A'),
+                    str(title_info.get('release_year') or 'N/A'),
+                    f"{imdb:.1f}/10" if imdb else 'N/A',
+                    f"{tmdb_pop:.1f}" if tmdb_pop else 'N/A',
+                    str(weeks) if weeks else '未上榜',
+                    f"#{best}" if best and best > 0 else '未上榜',
+                ]
+            })
+            st.table(summary_df.set_index('項目'))
             
             # 詳細資訊
             st.markdown("---")
             st.subheader("📊 詳細數據")
             
+            # 先取出欄位，再以表格一次渲染（取代逐行 st.write）
+            budget = title_info.get('budget', 0)
+            revenue = title_info.get('revenue', 0)
+            views_23 = title_info.get('views_2023', 0)
+            views_24 = title_info.get('views_2024', 0)
+            views_25 = title_info.get('views_2025', 0)
+            genres = title_info.get('genres') or 'N/A'
+            date_added = title_info.get('date_added') or 'N/A'
+            viral_rate = title_info.get('viral_rate')
+
+            stats_df = pd.DataFrame({
+                '項目': ['預算', '收益', '2023 觀看數', '2024 觀看數', '2025 觀看數'],
+                '數值': [
+                    f"${budget:,}" if budget else "無資料",
+                    f"${revenue:,}" if revenue else "無資料",
+                    f"{views_23:,}" if views_23 else "無資料",
+                    f"{views_24:,}" if views_24 else "無資料",
+                    f"{views_25:,}" if views_25 else "無資料",
+                ]
+            })
+
+            info_df = pd.DataFrame({
+                '項目': ['類別', '上架日期', '未來14天爆紅率'],
+                '數值': [
+                    str(genres),
+                    str(date_added),
+                    f"{viral_rate:.1f}%" if viral_rate is not None else "0%",
+                ]
+            })
+
             col1, col2 = st.columns(2)
-            
+
             with col1:
-                st.markdown("**💰 經濟數據**")
-                budget = title_info.get('budget', 0)
-                revenue = title_info.get('revenue', 0)
-                st.write(f"- 預算：${budget:,}" if budget else "- 預算：無資料")
-                st.write(f"- 收益：${revenue:,}" if revenue else "- 收益：無資料")
-                
-                st.markdown("**📺 觀看數據**")
-                views_23 = title_info.get('views_2023', 0)
-                views_24 = title_info.get('views_2024', 0)
-                views_25 = title_info.get('views_2025', 0)
-                st.write(f"- 2023 觀看數：{views_23:,}" if views_23 else "- 2023：無資料")
-                st.write(f"- 2024 觀看數：{views_24:,}" if views_24 else "- 2024：無資料")
-                st.write(f"- 2025 觀看數：{views_25:,}" if views_25 else "- 2025：無資料")
-            
+                st.markdown("**💰 經濟與觀看數據**")
+                st.table(stats_df.set_index('項目'))
+
             with col2:
                 st.markdown("**🎭 作品資訊**")
-                genres = title_info.get('genres', 'N/A')
-                st.write(f"- 類別：{genres}")
-                date_added = title_info.get('date_added', 'N/A')
-                st.write(f"- 上架日期：{date_added}")
-                
-                # 取得爆紅率
-                viral_rate = get_title_viral_rate(selected_title)
-                if viral_rate is not None:
-                    st.write(f"- 未來14天爆紅率：{viral_rate:.1f}%")
-                else:
-                    st.write("- 未來14天爆紅率：0%")
+                st.table(info_df.set_index('項目'))
         else:
             st.error("❌ 查無此作品資料")
+
+
+if USE_REAL_DATA:
+    render_search()
 else:
     # 假資料模式
     st.error("🚨 注意：目前使用模擬資料展示")
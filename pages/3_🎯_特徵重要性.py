@@ -1,7 +1,7 @@
 import streamlit as st
-import plotly.express as px
 
 from utils.bigquery_data import get_feature_importance
+from utils.charts import build_feature_importance_figure
 from utils.sidebar import render_sidebar
 
 st.set_page_config(
@@ -22,22 +22,7 @@ st.write("根據 XGBoost 模型，以下是影響作品爆紅的關鍵因素（
 importance_df = get_feature_importance()
 
 # 視覺化
-fig = px.bar(
-    importance_df,
-    x='importance',
-    y='feature_zh',
-    orientation='h',
-    title='XGBoost Feature Importance (by Gain)',
-    color='importance',
-    color_continuous_scale='Purples',
-    labels={'importance': 'Importance Gain', 'feature_zh': '特徵'}
-)
-
-fig.update_layout(
-    showlegend=False,
-    height=500,
-    yaxis={'categoryorder': 'total ascending'}
-)
+fig = build_feature_importance_figure(importance_df)
 
 st.plotly_chart(fig, use_container_width=True)
 
@@ -0,0 +1,13 @@
+"""
+共用工具模組 - Netflix 爆紅預測系統
+"""
+import plotly.io as pio
+
+# 使用 orjson 序列化 Plotly 圖表（st.plotly_chart 會呼叫 plotly.io.to_json）
+# 所有頁面都會匯入 utils，因此在這裡設定一次即可套用到整個 app
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    # 未安裝 orjson 時維持 Plotly 預設的 JSON encoder
+    pass
@@ -1,12 +1,15 @@
 """
 BigQuery 資料讀取功能 - Netflix 爆紅預測系統
 """
-from google.cloud import bigquery
 import pandas as pd
 import streamlit as st
-import os
-from pathlib import Path
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+from concurrent.futures import Future
+import threading
 import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 # 設定 GCP 認證
 # 使用 gcloud 登入的憑證，不需要 credentials.json
@@ -17,107 +20,313 @@ DATASET_FINAL = "netflix_final"
 DATASET_PREDICTIONS = "predictions"  
 DATASET_MODELS = "models"
 
+# 查詢設定：單次查詢計費上限（1 GB）與 job labels
+MAXIMUM_BYTES_BILLED = 1_000_000_000
+QUERY_LABELS = {"app": "netflix-viral"}
+
+# 字串欄位以 Arrow 儲存（取代 numpy object dtype），較省記憶體
+ARROW_STRING_DTYPE = pd.StringDtype(storage="pyarrow")
+
+# 從預測結果的機率陣列中取出 label=1（爆紅）的機率
+VIRAL_PROB_EXPR = "(SELECT prob FROM UNNEST(predicted_future_viral_14d_probs) WHERE label = 1)"
+
+# 作品詳細資訊欄位（final_dataset_ready）
+TITLE_DETAIL_COLUMNS = """
+    uid,
+    title,
+    type,
+    country,
+    language,
+    release_year,
+    rating as imdb_rating,
+    genres,
+    date_added,
+    popularity as tmdb_popularity,
+    vote_count as tmdb_vote_count,
+    vote_average as tmdb_vote_average,
+    budget,
+    revenue,
+    weeks_on_top10,
+    best_rank,
+    on_top10_total_views,
+    on_top10_total_hours,
+    views_2023,
+    hours_2023,
+    views_2024,
+    hours_2024,
+    views_2025,
+    hours_2025,
+    future_viral_14d
+"""
+
 
-@st.cache_data(ttl=3600)  # 快取 1 小時
-def get_top10_predictions(date_str: str = None, lookback_days: int = 0):
+@st.cache_resource
+def get_bq_client():
     """
-    從 BigQuery 讀取最新的 Top 10 預測結果
-    
+    取得共用的 BigQuery Client（整個 app 只建立一次）
+
+    所有 session 與 rerun 共用同一個 client，避免每次查詢都重新認證與建立連線。
+    注意：這是共用物件，請勿修改其屬性。
+
+    JOB_CREATION_OPTIONAL 讓 query_and_wait 在短查詢時不必建立 job，降低延遲。
+
+    google.cloud.bigquery 載入成本高，只在第一次需要查詢時才匯入（特徵重要性等頁面不需要）
+
     回傳:
-        tuple: (DataFrame, snapshot_table_name) 若成功；失敗回傳 None
+        bigquery.Client
+    """
+    from google.cloud import bigquery
+
+    return bigquery.Client(
+        project=PROJECT_ID,
+        default_job_creation_mode="JOB_CREATION_OPTIONAL"
+    )
+
+
+def _run_query(query: str, params: list = None):
+    """
+    以統一的 QueryJobConfig 執行查詢並等待結果
+
+    所有查詢共用：明確使用 BigQuery 結果快取、單次查詢計費上限、以及方便在帳單中分組的 labels。
+    注意：BigQuery 無法參數化表名，表名仍需由呼叫端以 f-string 組合
+
+    參數:
+        query: str, SQL 查詢
+        params: list, 查詢參數 (name, type, value) 列表，例如 [("title", "STRING", title)]
+
+    回傳:
+        RowIterator: 可用 .to_dataframe()、.to_arrow() 或直接迭代 Row
+    """
+    from google.cloud import bigquery
+
+    job_config = bigquery.QueryJobConfig(
+        use_query_cache=True,
+        maximum_bytes_billed=MAXIMUM_BYTES_BILLED,
+        labels=QUERY_LABELS,
+        query_parameters=[
+            bigquery.ScalarQueryParameter(name, type_, value)
+            for name, type_, value in (params or [])
+        ]
+    )
+    return get_bq_client().query_and_wait(query, job_config=job_config)
+
+
+def prefetch(func, *args, **kwargs):
+    """
+    在背景執行緒先行呼叫查詢函式，讓 BigQuery 等待時間與頁面渲染重疊
+
+    背景執行緒會掛上目前的 ScriptRunContext，因此可以使用 st.cache_data；
+    但 func 不應呼叫 st.error 等顯示元件（出現在頁面的位置取決於執行緒時序），
+    錯誤請以例外拋出，由主執行緒在 .result() 時處理。
+
+    參數:
+        func: 要執行的函式（通常是有快取的查詢函式）
+        *args, **kwargs: 傳給 func 的參數
+
+    回傳:
+        concurrent.futures.Future: 以 .result() 取得 func 的回傳值
+    """
+    future = Future()
+
+    def _run():
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+
+    thread = threading.Thread(target=_run, daemon=True)
+    add_script_run_ctx(thread)
+    thread.start()
+    return future
+
+
+@st.cache_data(ttl=600, show_spinner=False)  # 快取 10 分鐘
+def _list_prediction_tables():
+    """
+    列出 predictions dataset 中的所有表名
+
+    回傳:
+        list: table_id 列表；無法列出（權限、網路等）時拋出例外，失敗結果不會被快取
+    """
+    client = get_bq_client()
+    dataset_ref = f"{PROJECT_ID}.{DATASET_PREDICTIONS}"
+    return [t.table_id for t in client.list_tables(dataset_ref)]
+
+
+def _try_list_prediction_tables():
+    """
+    列出預測表；失敗時記錄 log 並回傳空 list（本次改用預設表，下次呼叫會重新嘗試）
+
+    回傳:
+        list: table_id 列表
     """
     try:
-        client = bigquery.Client(project=PROJECT_ID)
-        # 預設會優先嘗試使用 dataset 中最新的 snapshot table：prediction_YYYYMMDD
-        # 若找不到再回退到 prediction_latest。若使用者提供 date_str 或 lookback_days，則以該邏輯為主。
-        table_to_query = f"{PROJECT_ID}.{DATASET_PREDICTIONS}.prediction_latest"
+        return _list_prediction_tables()
+    except Exception:
+        logger.warning("無法列出 predictions dataset 的資料表", exc_info=True)
+        return []
 
-        # 如果使用者沒有指定 date_str 且沒有要求回溯，嘗試自動尋找 dataset 中最新的 prediction_YYYYMMDD
-        if not date_str and lookback_days == 0:
-            try:
-                dataset_ref = f"{PROJECT_ID}.{DATASET_PREDICTIONS}"
-                tables = list(client.list_tables(dataset_ref))
-                latest_date = None
-                latest_table = None
-                for t in tables:
-                    # t.table_id 可能是 like 'prediction_20251130' or 'prediction_latest'
-                    tid = t.table_id
-                    if tid.startswith('prediction_') and len(tid) >= len('prediction_') + 8:
-                        suffix = tid.replace('prediction_', '')
-                        # Expect suffix to be YYYYMMDD
-                        try:
-                            dt = datetime.datetime.strptime(suffix, '%Y%m%d')
-                            if latest_date is None or dt > latest_date:
-                                latest_date = dt
-                                latest_table = f"{dataset_ref}.{tid}"
-                        except Exception:
-                            continue
-                if latest_table:
-                    table_to_query = latest_table
-            except Exception:
-                # 如果列表失敗（權限等），退回到後續的日期搜尋或 prediction_latest
-                pass
 
-        # 決定要檢查的日期列表（包含指定日期或今天，並視 lookback_days 向前搜尋）
-        dates_to_try = []
-        if date_str:
+def _resolve_latest_prediction_table():
+    """
+    找出 predictions dataset 中最新的 prediction_YYYYMMDD 表
+
+    回傳:
+        str: 完整表名；若找不到日期快照（或無法列出表格）則回傳 prediction_latest
+    """
+    dataset_ref = f"{PROJECT_ID}.{DATASET_PREDICTIONS}"
+    latest_date = None
+    latest_table = None
+    for tid in _try_list_prediction_tables():
+        # tid 可能是 like 'prediction_20251130' or 'prediction_latest'
+        if tid.startswith('prediction_') and len(tid) >= len('prediction_') + 8:
+            suffix = tid.replace('prediction_', '')
+            # Expect suffix to be YYYYMMDD
             try:
-                base_date = datetime.datetime.strptime(date_str, "%Y%m%d")
+                dt = datetime.datetime.strptime(suffix, '%Y%m%d')
+                if latest_date is None or dt > latest_date:
+                    latest_date = dt
+                    latest_table = f"{dataset_ref}.{tid}"
             except Exception:
-                # 如果傳入格式不正確，改用今天
-                base_date = datetime.datetime.utcnow()
-        else:
+                continue
+
+    if latest_table:
+        return latest_table
+    return f"{dataset_ref}.prediction_latest"
+
+
+def _viral_prob_source(table: str):
+    """
+    決定爆紅機率的讀取來源
+
+    若預測流程已產生攤平版本 <table>_flat（viral_prob 為純量欄位），改讀該表，
+    BigQuery 不必掃描 predicted_future_viral_14d_probs 陣列欄位；否則沿用原表並以 UNNEST 取出 label=1 的機率。
+
+    參數:
+        table: str, 完整預測表名
+
+    回傳:
+        tuple: (要查詢的完整表名, viral_prob 的 SQL 表達式)
+    """
+    flat_id = f"{table.split('.')[-1]}_flat"
+    if flat_id in _try_list_prediction_tables():
+        return f"{PROJECT_ID}.{DATASET_PREDICTIONS}.{flat_id}", "viral_prob"
+    return table, VIRAL_PROB_EXPR
+
+
+def _resolve_prediction_table(date_str: str = None, lookback_days: int = 0):
+    """
+    決定要查詢的預測表（get_top10_predictions 與 get_title_details_with_viral 共用）
+
+    最新表的解析不另外快取：表名列表已快取，列表失敗時的 prediction_latest 回退也就不會被快取
+
+    參數:
+        date_str: str, 指定日期 (YYYYMMDD 格式)
+        lookback_days: int, 向前搜尋天數
+
+    回傳:
+        str: 完整表名
+    """
+    # 如果使用者沒有指定 date_str 且沒有要求回溯，使用 dataset 中最新的 prediction_YYYYMMDD
+    if not date_str and lookback_days == 0:
+        return _resolve_latest_prediction_table()
+
+    return _resolve_dated_prediction_table(date_str, lookback_days)
+
+
+@st.cache_data(ttl=600, show_spinner=False)  # 快取 10 分鐘
+def _resolve_dated_prediction_table(date_str: str = None, lookback_days: int = 0):
+    """
+    依指定日期與回溯天數找出存在的 prediction_YYYYMMDD 表
+
+    參數:
+        date_str: str, 指定日期 (YYYYMMDD 格式)
+        lookback_days: int, 向前搜尋天數
+
+    回傳:
+        str: 完整表名；都不存在時回傳 prediction_latest
+    """
+    # 決定要檢查的日期列表（包含指定日期或今天，並視 lookback_days 向前搜尋）
+    if date_str:
+        try:
+            base_date = datetime.datetime.strptime(date_str, "%Y%m%d")
+        except Exception:
+            # 如果傳入格式不正確，改用今天
             base_date = datetime.datetime.utcnow()
+    else:
+        base_date = datetime.datetime.utcnow()
 
+    # 只有在使用者明確指定日期或 lookback 時，才採用日期回溯策略
+    if date_str or lookback_days > 0:
+        client = get_bq_client()
         for d in range(0, max(lookback_days, 0) + 1):
             try_date = (base_date - datetime.timedelta(days=d)).strftime("%Y%m%d")
-            dates_to_try.append(try_date)
-
-        # 只有在使用者明確指定日期或 lookback 時，才優先採用日期回溯策略
-        if date_str or lookback_days > 0:
-            for try_date in dates_to_try:
-                candidate = f"{PROJECT_ID}.{DATASET_PREDICTIONS}.prediction_{try_date}"
-                try:
-                    # 嘗試取得 table metadata
-                    client.get_table(candidate)
-                    table_to_query = candidate
-                    break
-                except Exception:
-                    # table 不存在或無法存取，繼續下一個日期
-                    continue
+            candidate = f"{PROJECT_ID}.{DATASET_PREDICTIONS}.prediction_{try_date}"
+            try:
+                # 嘗試取得 table metadata
+                client.get_table(candidate)
+                return candidate
+            except Exception:
+                # table 不存在或無法存取，繼續下一個日期
+                continue
+
+    return f"{PROJECT_ID}.{DATASET_PREDICTIONS}.prediction_latest"
+
+
+def warm_up():
+    """
+    預先建立 BigQuery client 並解析最新的預測表（兩者皆有快取）
+
+    搭配 prefetch() 在頁面渲染時於背景執行，之後的第一次查詢就不必再等待認證與 list_tables
+    """
+    _resolve_prediction_table()
+
+
+@st.cache_data(ttl=3600, show_spinner=False)  # 快取 1 小時
+def get_top10_predictions(date_str: str = None, lookback_days: int = 0):
+    """
+    從 BigQuery 讀取最新的 Top 10 預測結果
+    
+    參數:
+        date_str: str, 指定預測日期（YYYYMMDD），預設使用最新的 snapshot
+        lookback_days: int, 往前回溯的天數
+    
+    回傳:
+        tuple: (DataFrame, snapshot_table_name) 若成功；沒有資料回傳 None
+        查詢失敗時拋出例外（不會被快取，也可能在 prefetch 的背景執行緒執行，
+        因此這裡不呼叫 st.error，由呼叫端在主執行緒顯示錯誤）
+    """
+    try:
+        # 預設使用 dataset 中最新的 snapshot table：prediction_YYYYMMDD，找不到再回退到 prediction_latest。
+        # 若使用者提供 date_str 或 lookback_days，則以日期回溯邏輯為主。
+        table_to_query, viral_prob_expr = _viral_prob_source(
+            _resolve_prediction_table(date_str, lookback_days)
+        )
 
         # 建立查詢，從選定的 table 讀取並提取 label=1 的機率
         query = f"""
         WITH prob_extracted AS (
+            -- 只選取前端實際使用的欄位（BigQuery 依選取欄位計費與傳輸）
             SELECT
-                uid,
                 title,
                 type,
                 country,
-                language,
-                imdb_rating,
-                tmdb_popularity,
-                tmdb_vote_count,
-                tmdb_vote_average,
-                log_budget,
-                log_revenue,
-                release_year,
-                duration_val,
-                predicted_future_viral_14d,
-                predicted_future_viral_14d_probs,
-                -- 提取 label=1 (爆紅) 的機率
-                (SELECT prob FROM UNNEST(predicted_future_viral_14d_probs) WHERE label = 1) as viral_prob
+                -- 提取 label=1 (爆紅) 的機率（攤平表則直接讀 viral_prob 欄位）
+                {viral_prob_expr} as viral_prob
             FROM `{table_to_query}`
-            WHERE predicted_future_viral_14d_probs IS NOT NULL
         )
-        SELECT *
+        SELECT
+            title,
+            type,
+            country,
+            viral_prob
         FROM prob_extracted
         WHERE viral_prob IS NOT NULL
         ORDER BY viral_prob DESC
         LIMIT 10
         """
 
-        df = client.query(query).to_dataframe()
+        df = _run_query(query).to_dataframe(string_dtype=ARROW_STRING_DTYPE)
 
         if not df.empty:
             # 轉換為百分比
@@ -128,40 +337,50 @@ def get_top10_predictions(date_str: str = None, lookback_days: int = 0):
         else:
             return None
         
-    except Exception as e:
-        st.error(f"❌ 讀取預測資料失敗：{str(e)}")
-        import traceback
-        st.error(traceback.format_exc())
-        return None
+    except Exception:
+        # 完整錯誤只記錄在伺服器端 log，頁面上的簡短訊息由呼叫端顯示
+        logger.exception("讀取預測資料失敗")
+        raise
+
 
-@st.cache_data(ttl=3600)
-def get_all_titles():
+@st.cache_data(ttl=600, max_entries=256, show_spinner=False)  # key 為使用者輸入的文字，限制快取數量
+def search_titles(keyword: str, limit: int = 50):
     """
-    取得所有可查詢的作品列表
-    
+    依關鍵字搜尋作品名稱（開頭比對，不分大小寫）
+
+    只回傳符合的前幾筆，避免每次都載入完整的作品列表
+
+    參數:
+        keyword: str, 使用者輸入的搜尋字串
+        limit: int, 最多回傳筆數
+
     回傳:
         list: 作品名稱列表
     """
     try:
-        client = bigquery.Client(project=PROJECT_ID)
-        
-        # 從 final_dataset_ready 讀取
         query = f"""
         SELECT DISTINCT title
         FROM `{PROJECT_ID}.{DATASET_FINAL}.final_dataset_ready`
         WHERE title IS NOT NULL
+          AND STARTS_WITH(LOWER(title), LOWER(@keyword))
         ORDER BY title
+        LIMIT @limit
         """
-        
-        df = client.query(query).to_dataframe()
+
+        params = [
+            ("keyword", "STRING", keyword),
+            ("limit", "INT64", limit)
+        ]
+
+        df = _run_query(query, params).to_dataframe()
         return df['title'].tolist()
-        
+
     except Exception as e:
-        st.error(f"❌ 讀取作品列表失敗：{str(e)}")
+        st.error(f"❌ 搜尋作品失敗：{str(e)}")
         return []
 
 
-@st.cache_data(ttl=3600)
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
 def get_title_details(title):
     """
     查詢特定作品的詳細資訊
@@ -173,92 +392,121 @@ def get_title_details(title):
         dict: 作品詳細資訊
     """
     try:
-        client = bigquery.Client(project=PROJECT_ID)
-        
         # 從 final_dataset_ready 查詢
         query = f"""
-        SELECT
-            uid,
-            title,
-            type,
-            country,
-            language,
-            release_year,
-            rating as imdb_rating,
-            genres,
-            date_added,
-            popularity as tmdb_popularity,
-            vote_count as tmdb_vote_count,
-            vote_average as tmdb_vote_average,
-            budget,
-            revenue,
-            weeks_on_top10,
-            best_rank,
-            on_top10_total_views,
-            on_top10_total_hours,
-            views_2023,
-            hours_2023,
-            views_2024,
-            hours_2024,
-            views_2025,
-            hours_2025,
-            future_viral_14d
+        SELECT {TITLE_DETAIL_COLUMNS}
         FROM `{PROJECT_ID}.{DATASET_FINAL}.final_dataset_ready`
         WHERE title = @title
         LIMIT 1
         """
         
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("title", "STRING", title)
-            ]
-        )
-        
-        df = client.query(query, job_config=job_config).to_dataframe()
+        params = [
+            ("title", "STRING", title)
+        ]
         
-        if not df.empty:
-            result = df.iloc[0].to_dict()
-            return result
-        else:
-            return None
+        # 只有一筆結果，直接把 Row 轉成 dict，不經過 pandas
+        row = next(iter(_run_query(query, params)), None)
+        return dict(row) if row is not None else None
             
     except Exception as e:
         st.error(f"❌ 查詢失敗：{str(e)}")
         return None
 
 
-@st.cache_data(ttl=3600)
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def get_title_details_with_viral(title: str, date_str: str = None, lookback_days: int = 0):
+    """
+    以單一查詢取得作品詳細資訊與未來 14 天爆紅率
+
+    將 final_dataset_ready 與預測表（選表邏輯同 get_top10_predictions()）以 title LEFT JOIN，
+    一次取得兩者，不必對作品資料表與預測表分別查詢
+
+    參數:
+        title: str, 作品名稱
+        date_str: str, 指定日期 (YYYYMMDD 格式)
+        lookback_days: int, 向前搜尋天數
+
+    回傳:
+        dict: 作品詳細資訊，另含 viral_rate（爆紅率百分比 0-100，無預測資料時為 None）
+    """
+    try:
+        prediction_table, viral_prob_expr = _viral_prob_source(
+            _resolve_prediction_table(date_str, lookback_days)
+        )
+
+        query = f"""
+        WITH details AS (
+            SELECT {TITLE_DETAIL_COLUMNS}
+            FROM `{PROJECT_ID}.{DATASET_FINAL}.final_dataset_ready`
+            WHERE title = @title
+            LIMIT 1
+        ),
+        prediction AS (
+            SELECT
+                title,
+                {viral_prob_expr} as viral_prob
+            FROM `{prediction_table}`
+            WHERE title = @title
+            LIMIT 1
+        )
+        SELECT
+            details.*,
+            prediction.viral_prob
+        FROM details
+        LEFT JOIN prediction ON details.title = prediction.title
+        """
+
+        params = [
+            ("title", "STRING", title)
+        ]
+
+        # 只有一筆結果，直接把 Row 轉成 dict，不經過 pandas
+        row = next(iter(_run_query(query, params)), None)
+        if row is None:
+            return None
+
+        result = dict(row)
+        viral_prob = result.pop('viral_prob', None)
+        result['viral_rate'] = float(viral_prob) * 100 if viral_prob is not None else None
+        return result
+
+    except Exception as e:
+        st.error(f"❌ 查詢失敗：{str(e)}")
+        return None
+
+
+# Feature Importance（根據你們 PPT 的圖表數據）
+# 資料寫死，在匯入時建立並排序一次即可，不需要 st.cache_data
+_FEATURE_IMPORTANCE_DF = pd.DataFrame({
+    'feature': [
+        'log_revenue', 'release_year', 'tmdb_vote_count', 'log_budget',
+        'type', 'language', 'imdb_rating', 'tmdb_popularity',
+        'primary_genre', 'country', 'duration_val', 'tmdb_vote_average'
+    ],
+    'importance': [
+        3.6, 3.4, 3.2, 2.6, 2.2, 2.0, 1.9, 1.6, 1.5, 1.3, 0.2, 0.1
+    ],
+    'feature_zh': [
+        '票房收益 (log)', '發行年份', 'TMDB 投票數', '製作預算 (log)',
+        '作品類型', '語言', 'IMDb 評分', 'TMDB 熱度',
+        '主要類別', '製作國家', '時長', 'TMDB 平均分'
+    ]
+}).sort_values('importance', ascending=False).reset_index(drop=True)
+
+
 def get_feature_importance():
     """
     取得 Feature Importance (根據 XGBoost 結果) !這是寫死的!
+
+    回傳的是共用的模組層級 DataFrame，請勿就地修改
     
     回傳:
         DataFrame: feature 和 importance
     """
-    # 根據你們 PPT 的圖表數據
-    importance_data = {
-        'feature': [
-            'log_revenue', 'release_year', 'tmdb_vote_count', 'log_budget',
-            'type', 'language', 'imdb_rating', 'tmdb_popularity',
-            'primary_genre', 'country', 'duration_val', 'tmdb_vote_average'
-        ],
-        'importance': [
-            3.6, 3.4, 3.2, 2.6, 2.2, 2.0, 1.9, 1.6, 1.5, 1.3, 0.2, 0.1
-        ],
-        'feature_zh': [
-            '票房收益 (log)', '發行年份', 'TMDB 投票數', '製作預算 (log)',
-            '作品類型', '語言', 'IMDb 評分', 'TMDB 熱度',
-            '主要類別', '製作國家', '時長', 'TMDB 平均分'
-        ]
-    }
-    
-    df = pd.DataFrame(importance_data)
-    df = df.sort_values('importance', ascending=False)
-    
-    return df
+    return _FEATURE_IMPORTANCE_DF
 
 
-@st.cache_data(ttl=86400)  # 快取 24 小時
+@st.cache_data  # 寫死的資料，部署期間不會變動，不需 TTL
 def get_model_performance():
     """
     取得模型效能指標（根據 PPT）!寫死的資料!
@@ -286,6 +534,25 @@ def get_model_performance():
     }
 
 
+# 模擬 Top 10 資料（USE_REAL_DATA = False 時使用）
+# 放在模組層級只在匯入時建立一次；app.py 本身每次 rerun 都會重新執行，不適合放在那裡
+MOCK_TOP10_PREDICTIONS = pd.DataFrame({
+    '排名': range(1, 11),
+    '作品名稱': [
+        'Stranger Things S5', 'Wednesday S2', 'The Crown S7',
+        'Squid Game S3', 'Bridgerton S4', 'Money Heist: Korea',
+        'The Witcher S4', 'You S5', 'Ozark: The Return', 'Dark Desire S3'
+    ],
+    # 重複的字串欄位使用 Categorical，每個值只存一次
+    '類型': pd.Categorical(['TV Show'] * 10, categories=['TV Show', 'Movie']),
+    '製作國家': pd.Categorical(
+        ['US', 'US', 'UK', 'KR', 'US', 'KR', 'US', 'US', 'US', 'MX'],
+        categories=['US', 'UK', 'KR', 'MX']
+    ),
+    '爆紅機率': [95.2, 92.8, 89.5, 87.1, 85.3, 83.0, 81.2, 79.4, 77.6, 75.8]
+})
+
+
 def test_connection():
     """
     測試 BigQuery 連接
@@ -294,107 +561,8 @@ def test_connection():
         bool: 連接是否成功
     """
     try:
-        client = bigquery.Client(project=PROJECT_ID)
-        query = "SELECT 1 as test"
-        result = client.query(query).result()
+        _run_query("SELECT 1 as test")
         return True
     except Exception as e:
         st.error(f"❌ BigQuery 連接失敗：{str(e)}")
         return False
-
-
-@st.cache_data(ttl=3600)
-def get_title_viral_rate(title: str, date_str: str = None, lookback_days: int = 0):
-    """
-    取得特定作品的爆紅率（未來 14 天）
-    從 prediction_YYYYMMDD 或 prediction_latest 讀取
-    
-    參數:
-        title: str, 作品名稱
-        date_str: str, 指定日期 (YYYYMMDD 格式)
-        lookback_days: int, 向前搜尋天數
-    
-    回傳:
-        float: 爆紅率百分比 (0-100)，若無資料回傳 None
-    """
-    try:
-        client = bigquery.Client(project=PROJECT_ID)
-        
-        # 決定要查詢的表，邏輯同 get_top10_predictions()
-        table_to_query = f"{PROJECT_ID}.{DATASET_PREDICTIONS}.prediction_latest"
-
-        # 如果使用者沒有指定 date_str 且沒有要求回溯，嘗試自動尋找 dataset 中最新的 prediction_YYYYMMDD
-        if not date_str and lookback_days == 0:
-            try:
-                dataset_ref = f"{PROJECT_ID}.{DATASET_PREDICTIONS}"
-                tables = list(client.list_tables(dataset_ref))
-                latest_date = None
-                latest_table = None
-                for t in tables:
-                    tid = t.table_id
-                    if tid.startswith('prediction_') and len(tid) >= len('prediction_') + 8:
-                        suffix = tid.replace('prediction_', '')
-                        try:
-                            dt = datetime.datetime.strptime(suffix, '%Y%m%d')
-                            if latest_date is None or dt > latest_date:
-                                latest_date = dt
-                                latest_table = f"{dataset_ref}.{tid}"
-                        except Exception:
-                            continue
-                if latest_table:
-                    table_to_query = latest_table
-            except Exception:
-                pass
-
-        # 決定要檢查的日期列表
-        dates_to_try = []
-        if date_str:
-            try:
-                base_date = datetime.datetime.strptime(date_str, "%Y%m%d")
-            except Exception:
-                base_date = datetime.datetime.utcnow()
-        else:
-            base_date = datetime.datetime.utcnow()
-
-        for d in range(0, max(lookback_days, 0) + 1):
-            try_date = (base_date - datetime.timedelta(days=d)).strftime("%Y%m%d")
-            dates_to_try.append(try_date)
-
-        # 只有在使用者明確指定日期或 lookback 時，才優先採用日期回溯策略
-        if date_str or lookback_days > 0:
-            for try_date in dates_to_try:
-                candidate = f"{PROJECT_ID}.{DATASET_PREDICTIONS}.prediction_{try_date}"
-                try:
-                    client.get_table(candidate)
-                    table_to_query = candidate
-                    break
-                except Exception:
-                    continue
-
-        # 查詢該作品的爆紅率
-        query = f"""
-        SELECT
-            (SELECT prob FROM UNNEST(predicted_future_viral_14d_probs) WHERE label = 1) as viral_prob
-        FROM `{table_to_query}`
-        WHERE title = @title
-        LIMIT 1
-        """
-
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("title", "STRING", title)
-            ]
-        )
-
-        df = client.query(query, job_config=job_config).to_dataframe()
-
-        if not df.empty and 'viral_prob' in df.columns:
-            viral_prob = df.iloc[0]['viral_prob']
-            if viral_prob is not None:
-                return float(viral_prob) * 100
-        
-        return None
-
-    except Exception as e:
-        # 靜默失敗，不顯示錯誤訊息
-        return None
\ No newline at end of file
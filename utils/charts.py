@@ -0,0 +1,118 @@
+"""
+Plotly 圖表建構功能 - Netflix 爆紅預測系統
+"""
+import streamlit as st
+import plotly.express as px
+from plotly.colors import sample_colorscale
+
+
+def _sample_colors(values, colorscale):
+    """依數值在 colorscale 上取色（與 Plotly 以資料最小/最大值正規化的方式相同）"""
+    low, high = min(values), max(values)
+    span = high - low
+    positions = [(v - low) / span if span else 1.0 for v in values]
+    return sample_colorscale(colorscale, positions)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)  # 預測資料更新時會產生新的 key，只保留最近幾份
+def build_top10_figure(display_df):
+    """
+    建立 Top 10 作品爆紅機率的長條圖
+
+    以 DataFrame 內容作為快取鍵，資料不變時 rerun 直接重用快取的 figure dict，不必重新組裝圖表與計算顏色。
+    注意：st.plotly_chart 收到 dict 時仍會轉成 go.Figure 並驗證一次。
+
+    參數:
+        display_df: DataFrame, 需包含 '作品名稱' 與 '爆紅機率' 欄位
+
+    回傳:
+        dict: Plotly figure
+    """
+    # 欄位可能是 float32，先轉回 float64 並四捨五入，避免 JSON 出現 95.19999694824219 之類的數字
+    probs_series = display_df['爆紅機率'].astype('float64').round(1)
+    probs = probs_series.tolist()
+    labels = probs_series.map('{:.1f}%'.format).tolist()
+
+    return {
+        "data": [{
+            "type": "bar",
+            "x": probs,
+            "y": display_df['作品名稱'].tolist(),
+            "orientation": "h",
+            # 在伺服器端預先算好顏色，不需傳送 colorscale 給前端
+            "marker": {"color": _sample_colors(probs, "Reds")},
+            "text": labels,
+            "textposition": "auto",
+        }],
+        "layout": {
+            "title": {"text": "Top 10 作品爆紅機率視覺化"},
+            "xaxis": {"title": {"text": "爆紅機率 (%)"}},
+            "yaxis": {"title": {"text": ""}, "categoryorder": "total ascending"},
+            "height": 400,
+        }
+    }
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)  # 趨勢資料每小時更新，限制快取數量
+def build_trend_figure(trends_df, title, kind='line', height=None):
+    """
+    建立 Google Trends 討論度趨勢圖
+
+    趨勢資料不變時（例如只切換其他分頁的元件），rerun 直接重用快取的圖表。
+    回傳 px 建好的 go.Figure（而非 dict）：st.plotly_chart 收到 dict 時會再轉成 go.Figure 並驗證一次，
+    直接傳入 Figure 可省去這一步
+
+    參數:
+        trends_df: DataFrame 或 Series, index 為日期、值為討論度指數
+        title: str, 圖表標題
+        kind: str, 'line' 折線圖或 'area' 面積圖
+        height: int, 圖表高度（None 表示使用預設值）
+
+    回傳:
+        plotly Figure
+    """
+    plot = px.area if kind == 'area' else px.line
+    fig = plot(
+        trends_df,
+        title=title,
+        labels={'value': '討論度指數', 'date': '日期'}
+    )
+    if height is not None:
+        fig.update_layout(height=height)
+
+    return fig
+
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def build_feature_importance_figure(importance_df):
+    """
+    建立 XGBoost 特徵重要性長條圖
+
+    資料為寫死的常數，第一次建立後即由快取回傳 figure dict
+
+    參數:
+        importance_df: DataFrame, 需包含 'importance' 與 'feature_zh' 欄位
+
+    回傳:
+        dict: Plotly figure
+    """
+    importance = importance_df['importance'].tolist()
+
+    # 直接建立 bar trace，不經過 Plotly Express 的逐列 trace 產生流程
+    return {
+        "data": [{
+            "type": "bar",
+            "x": importance,
+            "y": importance_df['feature_zh'].tolist(),
+            "orientation": "h",
+            "marker": {"color": _sample_colors(importance, "Purples")},
+            "hovertemplate": "特徵=%{y}<br>Importance Gain=%{x}<extra></extra>",
+        }],
+        "layout": {
+            "title": {"text": "XGBoost Feature Importance (by Gain)"},
+            "xaxis": {"title": {"text": "Importance Gain"}},
+            "yaxis": {"title": {"text": "特徵"}, "categoryorder": "total ascending"},
+            "showlegend": False,
+            "height": 500,
+        }
+    }
@@ -1,30 +1,42 @@
 import streamlit as st
 
 
+# Netflix 風格 CSS（預設頁面導航已由 .streamlit/config.toml 的 showSidebarNavigation 關閉）
+_SIDEBAR_CSS = """
+<style>
+    /* Netflix 紅色主題 */
+    .stButton>button {
+        background-color: #E50914;
+        color: white;
+        border-radius: 4px;
+        border: none;
+        font-weight: bold;
+    }
+    .stButton>button:hover {
+        background-color: #B20710;
+    }
+    /* 側邊欄導航連結 */
+    [data-testid="stSidebar"] [data-testid="stPageLink-NavLink"] {
+        background-color: #E50914;
+        border-radius: 4px;
+    }
+    [data-testid="stSidebar"] [data-testid="stPageLink-NavLink"]:hover {
+        background-color: #B20710;
+    }
+    [data-testid="stSidebar"] [data-testid="stPageLink-NavLink"] p {
+        color: white;
+        font-weight: bold;
+    }
+    /* 側邊欄樣式 */
+    [data-testid="stSidebar"] {
+        background-color: #141414;
+    }
+</style>
+"""
+
+
 def _render_css():
-    st.markdown("""
-    <style>
-        /* 隱藏預設的頁面導航 */
-        [data-testid="stSidebarNav"] {
-            display: none;
-        }
-        /* Netflix 紅色主題 */
-        .stButton>button {
-            background-color: #E50914;
-            color: white;
-            border-radius: 4px;
-            border: none;
-            font-weight: bold;
-        }
-        .stButton>button:hover {
-            background-color: #B20710;
-        }
-        /* 側邊欄樣式 */
-        [data-testid="stSidebar"] {
-            background-color: #141414;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_SIDEBAR_CSS, unsafe_allow_html=True)
 
 
 def render_sidebar():
@@ -38,27 +50,8 @@ def render_sidebar():
         )
         st.markdown("---")
 
-        if st.button("🔥 預測 Top 10 爆紅作品", use_container_width=True):
-            try:
-                st.switch_page("app.py")
-            except Exception:
-                # fallback: do nothing if switch_page not available
-                pass
-
-        if st.button("🔍 作品搜尋", use_container_width=True):
-            try:
-                st.switch_page("pages/1_🔍_作品搜尋.py")
-            except Exception:
-                pass
-
-        if st.button("🌍 Google Trends", use_container_width=True):
-            try:
-                st.switch_page("pages/2_🌍_Google_Trends.py")
-            except Exception:
-                pass
-
-        if st.button("🎯 特徵重要性", use_container_width=True):
-            try:
-                st.switch_page("pages/3_🎯_特徵重要性.py")
-            except Exception:
-                pass
+        # st.page_link 直接切換頁面，不需先觸發一次按鈕的 rerun 再呼叫 switch_page
+        st.page_link("app.py", label="🔥 預測 Top 10 爆紅作品", use_container_width=True)
+        st.page_link("pages/1_🔍_作品搜尋.py", label="🔍 作品搜尋", use_container_width=True)
+        st.page_link("pages/2_🌍_Google_Trends.py", label="🌍 Google Trends", use_container_width=True)
+        st.page_link("pages/3_🎯_特徵重要性.py", label="🎯 特徵重要性", use_container_width=True)
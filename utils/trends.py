@@ -1,107 +1,336 @@
 """
 Google Trends 相關功能
 """
+import hashlib
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import streamlit as st
 import pandas as pd
+from pytrends.exceptions import ResponseError
 from pytrends.request import TrendReq
-import plotly.express as px
 
 # 從預測資料取得 top 項目
 from utils.bigquery_data import get_top10_predictions
+from utils.charts import build_trend_figure
 
-@st.cache_data(ttl=3600)  # 快取 1 小時
-def get_netflix_trends(keywords=None):
+logger = logging.getLogger(__name__)
+
+# 同時送出的 Google Trends 請求上限（避免超過約 4 rps 的限制）
+MAX_TRENDS_WORKERS = 4
+
+# 遇到 Google Trends 回應錯誤（如 429）時的重試設定：最多嘗試 3 次，等待 1 秒、2 秒（總計最多 3 秒）
+TRENDS_RETRIES = 3
+TRENDS_BACKOFF = 1.0
+
+# 第二層快取：跨 process / 重新部署仍保留的 SQLite 檔案（st.cache_data 為第一層）
+# 部署環境的 app 目錄可能是唯讀或暫存的，可用環境變數 TRENDS_CACHE_PATH 指定其他位置
+TRENDS_CACHE_PATH = os.environ.get('TRENDS_CACHE_PATH') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'trends.sqlite'
+)
+TRENDS_CACHE_TTL = 3600  # 秒
+
+
+def _trends_cache_key(keywords, timeframe, geo):
+    """以排序後的關鍵字、時間範圍與地區產生快取 key"""
+    payload = json.dumps({'kw': sorted(keywords), 'tf': timeframe, 'geo': geo})
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _open_trends_cache():
+    """開啟（必要時建立）磁碟快取；每次呼叫各自連線，可在多執行緒下使用"""
+    cache_dir = os.path.dirname(TRENDS_CACHE_PATH)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    conn = sqlite3.connect(TRENDS_CACHE_PATH, timeout=5)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS trends (key TEXT PRIMARY KEY, created_at REAL NOT NULL, data BLOB NOT NULL)'
+    )
+    return conn
+
+
+def _read_trends_cache(key):
     """
-    取得 Netflix 作品的 Google Trends 資料
+    從磁碟快取讀取資料
+    
+    回傳:
+        DataFrame；沒有資料、已過期或讀取失敗時回傳 None
+    """
+    try:
+        conn = _open_trends_cache()
+        try:
+            row = conn.execute('SELECT created_at, data FROM trends WHERE key = ?', (key,)).fetchone()
+        finally:
+            conn.close()
+        if row is None or time.time() - row[0] > TRENDS_CACHE_TTL:
+            return None
+        return pd.read_parquet(io.BytesIO(row[1]))
+    except Exception:
+        # 快取失效只影響速度，不影響結果
+        logger.warning("讀取 Google Trends 磁碟快取失敗", exc_info=True)
+        return None
+
+
+def _write_trends_cache(key, df):
+    """將資料以 parquet 格式寫入磁碟快取，並在同一個交易中清掉已過期的資料"""
+    try:
+        data = df.to_parquet()
+        now = time.time()
+        conn = _open_trends_cache()
+        try:
+            with conn:
+                # key 來自使用者輸入的關鍵字，不清理的話檔案會無限成長
+                conn.execute('DELETE FROM trends WHERE created_at < ?', (now - TRENDS_CACHE_TTL,))
+                conn.execute('INSERT OR REPLACE INTO trends VALUES (?, ?, ?)', (key, now, data))
+        finally:
+            conn.close()
+    except Exception:
+        logger.warning("寫入 Google Trends 磁碟快取失敗", exc_info=True)
+
+
+def _build_batches(keywords):
+    """
+    將關鍵字切成 pytrends 可接受的批次（每批最多 5 個）
     
     參數:
-        keywords: list, 要查詢的關鍵字列表
+        keywords: list, 要查詢的關鍵字列表（第一個作為 anchor）
     
     回傳:
-        DataFrame 或 None
+        list[list[str]], 第一批為前 5 個關鍵字，後續每批為 anchor + 最多 4 個新關鍵字
     """
-    if keywords is None:
-        keywords = ['Stranger Things', 'Wednesday', 'Squid Game', 'The Crown', 'Bridgerton']
+    anchor = keywords[0]
+    batches = [keywords[:5]]
+    for idx in range(5, len(keywords), 4):
+        batches.append([anchor] + keywords[idx:idx+4])
+    return batches
 
-    try:
+
+# 每個執行緒各自保留一個 TrendReq（pytrends 的 cookie / session 不是 thread-safe）
+_thread_local = threading.local()
+
+
+def _get_pytrends():
+    """取得目前執行緒的 TrendReq，第一次使用時才建立（省下每次查詢重新取得 Google cookie 的請求）"""
+    pytrends = getattr(_thread_local, 'pytrends', None)
+    if pytrends is None:
         pytrends = TrendReq(hl='en-US', tz=360)
+        _thread_local.pytrends = pytrends
+    return pytrends
 
-        # Google Trends / pytrends accepts up to 5 keywords per payload.
-        # 如果關鍵字超過 5 個，分批查詢並以第一個關鍵字作為 anchor 對齊縮放後合併。
-        if len(keywords) <= 5:
-            pytrends.build_payload(keywords, timeframe='now 7-d', geo='')
-            interest_over_time = pytrends.interest_over_time()
-            if not interest_over_time.empty:
-                return interest_over_time.drop(columns=['isPartial'], errors='ignore')
-            return None
 
-        # 超過 5 個關鍵字的處理
-        anchor = keywords[0]
-        # 第一批使用前 5 個關鍵字
-        batches = []
-        batches.append(keywords[:5])
-        idx = 5
-        # 後續每批包含 anchor + 最多 4 個新關鍵字
-        while idx < len(keywords):
-            batch = [anchor] + keywords[idx:idx+4]
-            batches.append(batch)
-            idx += 4
-
-        df_total = None
-        baseline_anchor_series = None
-
-        for i, batch in enumerate(batches):
-            pytrends.build_payload(batch, timeframe='now 7-d', geo='')
-            df = pytrends.interest_over_time()
-            if df is None or df.empty:
+@st.cache_resource
+def _get_trends_executor():
+    """
+    所有 session 共用的 Google Trends 執行緒池
+    
+    執行緒會一直存在，各自的 TrendReq 因此可以跨查詢重複使用，
+    同時也把整個 app 同時送出的請求數限制在 MAX_TRENDS_WORKERS 以內。
+    """
+    return ThreadPoolExecutor(max_workers=MAX_TRENDS_WORKERS, thread_name_prefix='pytrends')
+
+
+def _fetch_batches(batches, timeframe='now 7-d', geo=''):
+    """
+    在共用執行緒池中平行查詢多個批次，遇到回應錯誤（如 429）時以指數退避重試失敗的批次
+    
+    退避等待在呼叫端執行，不佔用共用執行緒池，被限流時也不會拖慢其他 session 的查詢
+    
+    參數:
+        batches: list[list[str]], 關鍵字批次
+        timeframe: str, 時間範圍
+        geo: str, 地區代碼
+    
+    回傳:
+        list, 依批次順序排列的 DataFrame 或 None；重試用盡時拋出最後一次的 ResponseError
+    """
+    executor = _get_trends_executor()
+    results = [None] * len(batches)
+    pending = list(range(len(batches)))
+
+    for attempt in range(TRENDS_RETRIES):
+        futures = {i: executor.submit(_fetch_batch, batches[i], timeframe, geo) for i in pending}
+        failed = []
+        last_error = None
+        for i, future in futures.items():
+            try:
+                results[i] = future.result()
+            except ResponseError as e:
+                failed.append(i)
+                last_error = e
+
+        if not failed:
+            return results
+        if attempt == TRENDS_RETRIES - 1:
+            raise last_error
+
+        time.sleep(TRENDS_BACKOFF * (2 ** attempt))
+        pending = failed
+
+
+def _fetch_batch(batch, timeframe='now 7-d', geo=''):
+    """
+    查詢單一批次的趨勢，先查磁碟快取，沒有才呼叫 Google Trends
+    
+    參數:
+        batch: list, 最多 5 個關鍵字
+        timeframe: str, 時間範圍
+        geo: str, 地區代碼（空字串為全球）
+    
+    回傳:
+        DataFrame（已移除 isPartial 欄位）或 None
+    """
+    key = _trends_cache_key(batch, timeframe, geo)
+    cached = _read_trends_cache(key)
+    if cached is not None:
+        # key 不分順序，依本次查詢的關鍵字順序排列欄位
+        return cached[[kw for kw in batch if kw in cached.columns]]
+
+    pytrends = _get_pytrends()
+    try:
+        pytrends.build_payload(batch, timeframe=timeframe, geo=geo)
+        df = pytrends.interest_over_time()
+    except ResponseError:
+        # 被限流的 session / cookie 不再重用，下次查詢重新建立 TrendReq
+        _thread_local.pytrends = None
+        raise
+    if df is None or df.empty:
+        return None
+    df = df.drop(columns=['isPartial'], errors='ignore')
+    _write_trends_cache(key, df)
+    return df
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)  # 快取 1 小時
+def _fetch_netflix_trends(keywords):
+    """
+    查詢並合併多個關鍵字的 7 天趨勢（只快取成功的結果）
+    
+    參數:
+        keywords: list, 要查詢的關鍵字列表
+    
+    回傳:
+        DataFrame 或 None（查無資料）；查詢失敗時拋出例外，不會被快取
+    """
+    # Google Trends / pytrends accepts up to 5 keywords per payload.
+    # 如果關鍵字超過 5 個，分批查詢並以第一個關鍵字作為 anchor 對齊縮放後合併。
+    if len(keywords) <= 5:
+        df = _fetch_batches([keywords])[0]
+        # 分數為 0-100，float32 即足夠，傳給前端的圖表資料也較小
+        return df.astype('float32') if df is not None else None
+
+    # 超過 5 個關鍵字的處理
+    anchor = keywords[0]
+    batches = _build_batches(keywords)
+
+    # 各批次彼此獨立，平行送出請求；結果依批次順序回傳
+    results = _fetch_batches(batches)
+
+    scaled_frames = []
+    baseline_mean = None
+
+    # 縮放與合併很便宜，依序處理即可
+    for i, df in enumerate(results):
+        if df is None:
+            continue
+
+        if i == 0:
+            scaled_frames.append(df)
+            # baseline：第一批 anchor 的平均值，之後各批都以它為基準
+            if anchor in df.columns:
+                baseline_mean = float(df[anchor].astype(float).mean())
+        else:
+            # 對齊並縮放：以 anchor 為基準
+            if anchor not in df.columns or baseline_mean is None:
+                # 無法以 anchor 對齊，跳過此批
+                continue
+            batch_mean = float(df[anchor].astype(float).mean())
+            # 避免除以 0
+            scale = 0.0 if batch_mean == 0 else baseline_mean / batch_mean
+            if scale == 0:
+                # 縮放後全為 0，不必計算；缺的欄位最後由 reindex 補 0
                 continue
-            df = df.drop(columns=['isPartial'], errors='ignore')
 
-            if i == 0:
-                df_total = df.copy()
-                # baseline anchor series
-                if anchor in df_total.columns:
-                    baseline_anchor_series = df_total[anchor].astype(float)
+            # 移除 anchor（避免重複欄位）
+            cols = [c for c in df.columns if c != anchor]
+            if abs(scale - 1.0) < 1e-6:
+                # anchor 平均與基準相同，不需縮放
+                df_scaled = df[cols]
             else:
-                # 對齊並縮放：以 anchor 為基準
-                if anchor not in df.columns or baseline_anchor_series is None:
-                    # 無法以 anchor 對齊，跳過此批
-                    continue
-                batch_anchor = df[anchor].astype(float)
-                # 避免除以 0
-                if batch_anchor.mean() == 0:
-                    scale = 0
-                else:
-                    scale = baseline_anchor_series.mean() / batch_anchor.mean()
+                # 直接在 numpy 陣列上縮放，只配置一次 float32 陣列
+                df_scaled = pd.DataFrame(
+                    df[cols].to_numpy(dtype='float32') * np.float32(scale),
+                    index=df.index,
+                    columns=cols
+                )
+            scaled_frames.append(df_scaled)
+
+    if not scaled_frames:
+        return None
 
-                # 進行縮放並移除 anchor（避免重複欄位）
-                df_scaled = df.multiply(scale)
-                df_scaled = df_scaled.drop(columns=[anchor], errors='ignore')
+    # 所有批次收集完後一次合併（以時間 index 對齊），避免在迴圈中反覆複製整張表
+    df_total = pd.concat(scaled_frames, axis=1, join='outer', sort=False)
+    if df_total.empty:
+        return None
 
-                # 合併至總表（以時間 index 對齊）
-                df_total = pd.concat([df_total, df_scaled], axis=1)
+    # 一次轉換整張表為數值（float32 即足以表示 0-100 的分數），避免逐欄寫回造成的區塊複製
+    df_total = df_total.apply(pd.to_numeric, errors='coerce').astype('float32').fillna(0.0)
 
-        if df_total is None or df_total.empty:
-            return None
+    # 最後依原始 keywords 的順序排序欄位，缺的欄位補 0
+    df_total = df_total.reindex(columns=keywords, fill_value=0)
+    return df_total
 
-        # 最後依原始 keywords 的順序排序欄位，缺的欄位補 0
-        # 使用 astype(float) 保證數值型別一致
-        for col in df_total.columns:
-            df_total[col] = pd.to_numeric(df_total[col], errors='coerce').fillna(0)
 
-        df_total = df_total.reindex(columns=keywords, fill_value=0)
-        return df_total
+def get_netflix_trends(keywords=None):
+    """
+    取得 Netflix 作品的 Google Trends 資料
+    
+    參數:
+        keywords: list, 要查詢的關鍵字列表
+    
+    回傳:
+        DataFrame 或 None
+    """
+    if keywords is None:
+        keywords = ['Stranger Things', 'Wednesday', 'Squid Game', 'The Crown', 'Bridgerton']
 
+    try:
+        return _fetch_netflix_trends(keywords)
     except Exception as e:
+        # 失敗不進快取，下次重新整理就會再試，不必等 TTL 過期
         st.error(f"Google Trends API 錯誤: {str(e)}")
         return None
 
 
-@st.cache_data(ttl=1800)  # 快取 30 分鐘
+@st.cache_data(ttl=1800, max_entries=256, show_spinner=False)  # 快取 30 分鐘
+def fetch_single_trend(keyword, timeframe):
+    """
+    取得單一關鍵字在指定時間範圍內的 Google Trends 資料
+    
+    參數:
+        keyword: str, 作品名稱
+        timeframe: str, 時間範圍（如 'now 7-d'、'today 3-m'）
+    
+    回傳:
+        DataFrame 或 None（查無資料）；查詢失敗時拋出例外（不會被快取）
+    """
+    df = _fetch_batches([[keyword]], timeframe)[0]
+    return df.astype('float32') if df is not None else None
+
+
 def get_show_trend_score(show_name):
     """
     取得特定作品的 Google Trends 分數
     
+    快取由 fetch_single_trend 負責（只快取成功的查詢），這裡不另外快取，
+    查詢失敗時回傳的 0 就不會被當成真實分數保留 30 分鐘
+    
     參數:
         show_name: str, 作品名稱
     
@@ -109,19 +338,134 @@ def get_show_trend_score(show_name):
         float, 平均分數 (0-100)
     """
     try:
-        pytrends = TrendReq(hl='en-US', tz=360)
-        pytrends.build_payload([show_name], timeframe='now 7-d', geo='')
-        
-        interest_over_time = pytrends.interest_over_time()
-        
-        if not interest_over_time.empty:
-            avg_score = interest_over_time[show_name].mean()
-            return round(avg_score, 1)
-        else:
-            return 0
-    except Exception as e:
+        interest_over_time = fetch_single_trend(show_name, 'now 7-d')
+    except Exception:
         return 0
 
+    if interest_over_time is not None:
+        avg_score = float(interest_over_time[show_name].mean())
+        return round(avg_score, 1)
+    else:
+        return 0
+
+
+def _render_ranking_and_trend(plot_df):
+    """
+    顯示當前討論度排行與 7 天趨勢圖
+
+    參數:
+        plot_df: DataFrame, 已依關鍵字排好欄位的趨勢資料
+    """
+    # 最新一筆分數由高到低排序（只有幾個元素，直接用 numpy 排序即可）
+    latest_vals = plot_df.iloc[-1].to_numpy()
+    order = np.argsort(-latest_vals, kind='stable')
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("📊 當前討論度排行（前 5 名）")
+
+        ranking_df = pd.DataFrame({
+            '排名': np.arange(1, len(order) + 1),
+            '作品': plot_df.columns[order],
+            '討論度': latest_vals[order]
+        })
+
+        st.dataframe(
+            ranking_df,
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "討論度": st.column_config.ProgressColumn(
+                    "討論度指數",
+                    format="%d",
+                    min_value=0,
+                    max_value=100,
+                ),
+            }
+        )
+
+    with col2:
+        st.subheader("📈 7 天趨勢變化（前 10 名）")
+
+        # 僅繪製前 10 名的趨勢線
+        fig = build_trend_figure(
+            plot_df,
+            title='過去 7 天討論度趨勢（前 5 名）',
+            height=350
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def _render_comparison(plot_df, keywords):
+    """
+    作品討論度比較（multiselect + 面積圖）
+
+    使用 fragment：切換比較作品時只重新執行這個區塊，排行表與趨勢圖不會重畫
+    """
+    # 詳細趨勢圖（僅前 10 名）
+    st.subheader("🔥 熱度趨勢比較（前 5 名）")
+
+    selected_shows = st.multiselect(
+        "選擇要比較的作品（最多前 5 名）",
+        options=keywords,
+        default=keywords[:3]
+    )
+
+    if selected_shows:
+        fig2 = build_trend_figure(
+            plot_df[selected_shows],
+            title='作品討論度比較',
+            kind='area'
+        )
+        st.plotly_chart(fig2, use_container_width=True)
+
+
+@st.fragment
+def _render_custom_query():
+    """
+    自訂關鍵字查詢
+
+    使用 fragment：輸入、選擇時間範圍與按下查詢時只重新執行這個分頁
+    """
+    st.subheader("查詢特定作品的搜尋熱度")
+
+    custom_keyword = st.text_input("輸入作品名稱（英文）", "Stranger Things")
+    timeframe = st.selectbox(
+        "選擇時間範圍",
+        ["now 7-d", "today 1-m", "today 3-m", "today 12-m"],
+        format_func=lambda x: {
+            "now 7-d": "過去 7 天",
+            "today 1-m": "過去 1 個月",
+            "today 3-m": "過去 3 個月",
+            "today 12-m": "過去 12 個月"
+        }[x]
+    )
+
+    if st.button("🔍 查詢", type="primary"):
+        with st.spinner("查詢中..."):
+            try:
+                data = fetch_single_trend(custom_keyword, timeframe)
+
+                if data is not None:
+                    fig = build_trend_figure(
+                        data[custom_keyword],
+                        title=f'{custom_keyword} 搜尋趨勢'
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    avg_score = data[custom_keyword].mean()
+                    max_score = data[custom_keyword].max()
+
+                    col1, col2 = st.columns(2)
+                    col1.metric("平均搜尋熱度", f"{avg_score:.1f}/100")
+                    col2.metric("最高搜尋熱度", f"{max_score:.0f}/100")
+                else:
+                    st.warning("❌ 查無資料，請確認作品名稱是否正確")
+            except Exception as e:
+                st.error(f"❌ 查詢失敗：{str(e)}")
+
 
 def display_trends_section():
     """
@@ -136,7 +480,12 @@ def display_trends_section():
         # 僅使用 Top Predictions，固定取前 5 名作為關鍵字
         top_n = 5
         with st.spinner('正在載入預測結果...'):
-                pred_res = get_top10_predictions()
+                try:
+                    # 與首頁使用相同參數，直接共用已快取的 Top 10 結果，再於下方取前 top_n 名
+                    pred_res = get_top10_predictions()
+                except Exception:
+                    # 詳細錯誤已記錄在伺服器端 log；下方改用預設清單
+                    pred_res = None
                 if pred_res is not None:
                     pred_df, pred_snapshot = pred_res
                 else:
@@ -144,7 +493,11 @@ def display_trends_section():
 
         keywords = None
         if pred_df is not None and not pred_df.empty:
-            keywords = pred_df['title'].astype(str).head(top_n).tolist()
+            titles = pred_df['title'].head(top_n)
+            # BigQuery 回傳的已是字串欄位，只有其他型別才需要轉換
+            if not pd.api.types.is_string_dtype(titles):
+                titles = titles.astype(str)
+            keywords = titles.tolist()
         else:
             st.warning('⚠️ 無法載入預測結果，改用預設熱門清單（前 5 名）')
             # fallback: 使用內建列表的前 5 名
@@ -156,105 +509,15 @@ def display_trends_section():
             trends_data = get_netflix_trends(keywords=keywords)
 
         if trends_data is not None:
-            # 只顯示前 5 名（keywords 已限制為 top_n）
-            latest_scores = trends_data.iloc[-1].reindex(keywords).fillna(0).sort_values(ascending=False)
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.subheader("📊 當前討論度排行（前 5 名）")
-
-                ranking_df = pd.DataFrame({
-                    '排名': range(1, len(latest_scores) + 1),
-                    '作品': latest_scores.index,
-                    '討論度': latest_scores.values
-                })
-
-                st.dataframe(
-                    ranking_df,
-                    hide_index=True,
-                    use_container_width=True,
-                    column_config={
-                        "討論度": st.column_config.ProgressColumn(
-                            "討論度指數",
-                            format="%d",
-                            min_value=0,
-                            max_value=100,
-                        ),
-                    }
-                )
-
-            with col2:
-                st.subheader("📈 7 天趨勢變化（前 10 名）")
+            # 只顯示前 5 名（keywords 已限制為 top_n）；先切出一次，排行與兩張圖共用
+            plot_df = trends_data.reindex(columns=keywords, fill_value=0)
 
-                # 僅繪製前 10 名的趨勢線
-                fig = px.line(
-                    trends_data[keywords],
-                    title='過去 7 天討論度趨勢（前 5 名）',
-                    labels={'value': '討論度指數', 'date': '日期'}
-                )
-                fig.update_layout(height=350)
-                st.plotly_chart(fig, use_container_width=True)
-
-            # 詳細趨勢圖（僅前 10 名）
-            st.subheader("🔥 熱度趨勢比較（前 5 名）")
-
-            selected_shows = st.multiselect(
-                "選擇要比較的作品（最多前 5 名）",
-                options=keywords,
-                default=keywords[:3]
-            )
-
-            if selected_shows:
-                fig2 = px.area(
-                    trends_data[selected_shows],
-                    title='作品討論度比較',
-                    labels={'value': '討論度指數', 'date': '日期'}
-                )
-                st.plotly_chart(fig2, use_container_width=True)
+            _render_ranking_and_trend(plot_df)
+            _render_comparison(plot_df, keywords)
         else:
             st.warning("⚠️ 無法取得 Google Trends 資料，請稍後再試")
     
     with tab2:
-        st.subheader("查詢特定作品的搜尋熱度")
-        
-        custom_keyword = st.text_input("輸入作品名稱（英文）", "Stranger Things")
-        timeframe = st.selectbox(
-            "選擇時間範圍",
-            ["now 7-d", "today 1-m", "today 3-m", "today 12-m"],
-            format_func=lambda x: {
-                "now 7-d": "過去 7 天",
-                "today 1-m": "過去 1 個月",
-                "today 3-m": "過去 3 個月",
-                "today 12-m": "過去 12 個月"
-            }[x]
-        )
-        
-        if st.button("🔍 查詢", type="primary"):
-            with st.spinner("查詢中..."):
-                try:
-                    pytrends = TrendReq(hl='en-US', tz=360)
-                    pytrends.build_payload([custom_keyword], timeframe=timeframe, geo='')
-                    
-                    data = pytrends.interest_over_time()
-                    
-                    if not data.empty:
-                        fig = px.line(
-                            data[custom_keyword],
-                            title=f'{custom_keyword} 搜尋趨勢',
-                            labels={'value': '討論度指數', 'date': '日期'}
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                        avg_score = data[custom_keyword].mean()
-                        max_score = data[custom_keyword].max()
-                        
-                        col1, col2 = st.columns(2)
-                        col1.metric("平均搜尋熱度", f"{avg_score:.1f}/100")
-                        col2.metric("最高搜尋熱度", f"{max_score}/100")
-                    else:
-                        st.warning("❌ 查無資料，請確認作品名稱是否正確")
-                except Exception as e:
-                    st.error(f"❌ 查詢失敗：{str(e)}")
+        _render_custom_query()
     
     st.info("💡 資料來源：Google Trends API | 更新頻率：每小時")
\ No newline at end of file